@@ -1,8 +1,12 @@
-from flask import Flask, request, jsonify, render_template, g
+from flask import Flask, request, render_template, g
+import orjson
 import sqlite3
 import os
+import queue
+import re
+import threading
+import contextlib
 from datetime import datetime
-from werkzeug.utils import secure_filename
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'orguser.db')
@@ -10,27 +14,131 @@ DB_PATH = os.path.join(BASE_DIR, 'orguser.db')
 app = Flask(__name__, static_folder='static', template_folder='templates')
 app.config['DATABASE'] = DB_PATH
 app.config['JSON_SORT_KEYS'] = False
+app.config['DB_POOL_SIZE'] = 8
+app.config['SEARCH_PAGE_SIZE'] = 50
+app.config['SEARCH_MAX_PAGE_SIZE'] = 200
+
+# --- SQL used on the request path ---
+# kept as module constants so every request passes the identical string and
+# hits the connection's prepared-statement cache
+SQL_LIST_ORGS = 'SELECT * FROM organizations ORDER BY id DESC'
+SQL_GET_ORG = 'SELECT * FROM organizations WHERE id=?'
+SQL_INSERT_ORG = '''
+    INSERT INTO organizations (name, slug, support_email, phone, alt_phone, website, max_coordinators, timezone, language, status, pending_requests)
+    VALUES (?,?,?,?,?,?,?,?,?,?,?)
+    RETURNING *
+'''
+SQL_UPDATE_ORG_STATUS = 'UPDATE organizations SET status=? WHERE id=? RETURNING *'
+SQL_PAGE_ORGS = 'SELECT * FROM organizations WHERE id < ? ORDER BY id DESC LIMIT ? OFFSET ?'
+SQL_SEARCH_ORGS = '''
+    SELECT * FROM organizations
+    WHERE (name LIKE ? OR slug LIKE ?) AND id < ?
+    ORDER BY id DESC LIMIT ? OFFSET ?
+'''
+SQL_LIST_USERS = 'SELECT * FROM users ORDER BY id DESC'
+# the organization is checked and its name/slug copied in the INSERT itself;
+# an unknown org_id inserts nothing
+SQL_INSERT_USER = '''
+    INSERT INTO users (org_id, name, email, role, phone, timezone, organization_name, organization_slug)
+    SELECT o.id, ?, ?, ?, ?, ?, o.name, o.slug FROM organizations o WHERE o.id = ?
+    RETURNING *
+'''
+SQL_BULK_INSERT_USERS = '''
+    INSERT INTO users (org_id, name, email, role, phone, timezone, organization_name, organization_slug)
+    SELECT o.id, ?, ?, ?, ?, ?, o.name, o.slug FROM organizations o WHERE o.id = ?
+'''
+SQL_PAGE_USERS = 'SELECT * FROM users WHERE id < ? ORDER BY id DESC LIMIT ? OFFSET ?'
+SQL_SEARCH_USERS = '''
+    SELECT u.* FROM users_fts
+    JOIN users u ON u.id = users_fts.rowid
+    WHERE users_fts MATCH ? AND u.id < ?
+    ORDER BY u.id DESC LIMIT ? OFFSET ?
+'''
+
+# slugs keep lowercase letters, digits and dashes; anything else collapses to a dash
+_SLUG_RE = re.compile(r'[^a-z0-9-]+')
 
 # --- Database helpers (sqlite3, no SQLAlchemy) ---
+MAX_ROWID = 2 ** 63 - 1
+
+# journal_mode=WAL is persisted in the db file, so it only needs to be set once per process
+_wal_enabled = False
+
+def configure_connection(db):
+    global _wal_enabled
+    if not _wal_enabled:
+        db.execute('PRAGMA journal_mode=WAL')
+        _wal_enabled = True
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.execute('PRAGMA foreign_keys=ON')
+    db.execute('PRAGMA temp_store=MEMORY')
+    db.execute('PRAGMA cache_size=-20000')
+    # read pages straight from a memory map instead of copying them into the page cache
+    db.execute('PRAGMA mmap_size=268435456')
+
+def create_connection():
+    # connections move between worker threads through the pool, one request at a time
+    db = sqlite3.connect(app.config['DATABASE'], check_same_thread=False, cached_statements=256)
+    db.row_factory = sqlite3.Row
+    configure_connection(db)
+    return db
+
+def create_pool(size):
+    pool = queue.Queue(maxsize=size)
+    for _ in range(size):
+        pool.put(create_connection())
+    return pool
+
+_pool = create_pool(app.config['DB_POOL_SIZE'])
+
 def get_db():
     db = getattr(g, '_database', None)
     if db is None:
-        db = g._database = sqlite3.connect(app.config['DATABASE'])
-        db.row_factory = sqlite3.Row
+        db = g._database = _pool.get()
     return db
 
 @app.teardown_appcontext
 def close_connection(exception):
-    db = getattr(g, '_database', None)
+    db = g.pop('_database', None)
     if db is not None:
-        db.close()
+        # never hand a half-finished transaction to the next request
+        if db.in_transaction:
+            db.rollback()
+        _pool.put(db)
 
-def init_db():
-    db = get_db()
-    cur = db.cursor()
-    # organizations table
-    cur.execute('''
-    CREATE TABLE IF NOT EXISTS organizations (
+# PRAGMA data_version on a connection that never writes changes whenever any
+# other connection, in this or another worker process, commits. Caches are keyed
+# on it, so a write anywhere invalidates them.
+_watch = create_connection()
+_watch_lock = threading.Lock()
+
+def current_data_version():
+    with _watch_lock:
+        return _watch.execute('PRAGMA data_version').fetchone()[0]
+
+# Read-only list/search endpoints are served from an in-memory copy of the
+# database, refreshed with the backup API whenever the data_version has moved.
+# One lock covers refreshes and reads.
+_replica = sqlite3.connect(':memory:', check_same_thread=False)
+_replica.row_factory = sqlite3.Row
+_replica_lock = threading.RLock()
+_replica_data_version = None
+
+@contextlib.contextmanager
+def read_db():
+    # yields the replica and the data_version it reflects
+    global _replica_data_version
+    with _replica_lock:
+        data_version = current_data_version()
+        if data_version != _replica_data_version:
+            with _watch_lock:
+                _watch.backup(_replica)
+            _replica_data_version = data_version
+        yield _replica, data_version
+
+# table definitions; {table} lets upgrade_created_at() build a replacement under another name
+DDL_ORGANIZATIONS = '''
+    CREATE TABLE IF NOT EXISTS {table} (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         name TEXT NOT NULL,
         slug TEXT UNIQUE NOT NULL,
@@ -43,12 +151,11 @@ def init_db():
         language TEXT DEFAULT 'English',
         status TEXT DEFAULT 'Active',
         pending_requests INTEGER DEFAULT 0,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        created_at INTEGER NOT NULL DEFAULT (unixepoch())
     )
-    ''')
-    # users table
-    cur.execute('''
-    CREATE TABLE IF NOT EXISTS users (
+'''
+DDL_USERS = '''
+    CREATE TABLE IF NOT EXISTS {table} (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         org_id INTEGER,
         name TEXT NOT NULL,
@@ -56,32 +163,164 @@ def init_db():
         role TEXT NOT NULL,
         phone TEXT,
         timezone TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        created_at INTEGER NOT NULL DEFAULT (unixepoch()),
+        organization_name TEXT,
+        organization_slug TEXT,
         FOREIGN KEY (org_id) REFERENCES organizations(id) ON DELETE CASCADE
     )
+'''
+
+def upgrade_created_at(cur, table, ddl):
+    # created_at used to be TEXT (CURRENT_TIMESTAMP). SQLite can't change a column's
+    # type in place, so copy the rows into a table built from the current DDL and
+    # swap it in; indexes and triggers are recreated afterwards by create_schema().
+    new_table = f'{table}_new'
+    cur.execute(ddl.format(table=new_table))
+    old_cols = {row[1] for row in cur.execute(f'PRAGMA table_info({table})')}
+    cols = [row[1] for row in cur.execute(f'PRAGMA table_info({new_table})') if row[1] in old_cols]
+    select = ', '.join('COALESCE(unixepoch(created_at), unixepoch())' if c == 'created_at' else c for c in cols)
+    cur.execute(f'INSERT INTO {new_table} ({", ".join(cols)}) SELECT {select} FROM {table}')
+    cur.execute(f'DROP TABLE {table}')
+    cur.execute(f'ALTER TABLE {new_table} RENAME TO {table}')
+
+def init_db():
+    # Worker processes start concurrently against the same file, so every schema
+    # check, migration and the seed run in one IMMEDIATE transaction: the first
+    # process to take the write lock does the work, the others wait on it and
+    # then find the schema already current. foreign_keys can't be changed inside
+    # a transaction, so it is switched off beforehand (a table rebuild must not
+    # cascade deletes into users).
+    db = get_db()
+    db.execute('PRAGMA foreign_keys=OFF')
+    try:
+        db.execute('BEGIN IMMEDIATE')
+        create_schema(db.cursor())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.execute('PRAGMA foreign_keys=ON')
+
+def create_schema(cur):
+    cur.execute(DDL_ORGANIZATIONS.format(table='organizations'))
+    cur.execute(DDL_USERS.format(table='users'))
+    # organization_name/organization_slug are copies of the parent org's columns so
+    # user listings don't need a join; they are kept in step by the triggers below
+    sync_org_columns = '''
+    UPDATE users SET organization_name = o.name, organization_slug = o.slug
+    FROM organizations o WHERE o.id = users.org_id
+    '''
+    cur.execute('PRAGMA table_info(users)')
+    if 'organization_name' not in {row['name'] for row in cur.fetchall()}:
+        # databases created before the columns existed
+        cur.execute('ALTER TABLE users ADD COLUMN organization_name TEXT')
+        cur.execute('ALTER TABLE users ADD COLUMN organization_slug TEXT')
+        cur.execute(sync_org_columns)
+
+    legacy = [
+        (table, ddl) for table, ddl in (('organizations', DDL_ORGANIZATIONS), ('users', DDL_USERS))
+        if cur.execute(f"SELECT type FROM pragma_table_info('{table}') WHERE name='created_at'").fetchone()[0] != 'INTEGER'
+    ]
+    if legacy:
+        # ALTER TABLE ... RENAME re-parses every trigger, and one naming a table
+        # that is mid-rebuild fails it; all triggers are recreated below
+        cur.execute("SELECT name FROM sqlite_master WHERE type='trigger'")
+        for (name,) in cur.fetchall():
+            cur.execute(f'DROP TRIGGER {name}')
+    for table, ddl in legacy:
+        upgrade_created_at(cur, table, ddl)
+
+    cur.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_org_rename AFTER UPDATE OF name, slug ON organizations BEGIN
+        UPDATE users SET organization_name = NEW.name, organization_slug = NEW.slug WHERE org_id = NEW.id;
+    END
     ''')
-    db.commit()
+    cur.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_users_org_change AFTER UPDATE OF org_id ON users BEGIN
+        UPDATE users SET
+            organization_name = (SELECT name FROM organizations WHERE id = NEW.org_id),
+            organization_slug = (SELECT slug FROM organizations WHERE id = NEW.org_id)
+        WHERE id = NEW.id;
+    END
+    ''')
+    # per-organization user lookups (org triggers, cascades); organizations.slug is
+    # already indexed through its UNIQUE constraint, and searches go through
+    # '%q%' LIKE or FTS, which plain column indexes can't serve
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_users_org ON users(org_id)')
+    # one account per email; a named index rather than a column constraint so it
+    # also applies to databases created before it existed. Rows are never changed
+    # here: while duplicates exist the index is left out, and it is created on the
+    # first start after they have been resolved.
+    cur.execute("SELECT 1 FROM sqlite_master WHERE name='idx_users_email_unique'")
+    if cur.fetchone() is None:
+        cur.execute('SELECT group_concat(id) FROM users GROUP BY email HAVING COUNT(*) > 1')
+        duplicates = [row[0] for row in cur.fetchall()]
+        if duplicates:
+            app.logger.warning('users.email is not unique (user ids %s); email uniqueness is not enforced',
+                               '; '.join(duplicates))
+        else:
+            cur.execute('CREATE UNIQUE INDEX idx_users_email_unique ON users(email)')
 
-    # Seed with sample data if empty
-    cur.execute('SELECT COUNT(*) as c FROM organizations')
-    if cur.fetchone()['c'] == 0:
+    # full-text index for user search; contentless, rowid = users.id
+    cur.execute("SELECT 1 FROM sqlite_master WHERE name='users_fts'")
+    fts_exists = cur.fetchone() is not None
+    cur.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(name, email, org_name, content='')
+    ''')
+    # The 'delete' command of a contentless table must repeat exactly the values
+    # that were indexed, so org_name always comes from the row's own
+    # organization_name (the organization may already be gone during a cascade).
+    # Organization renames reach the index through trg_org_rename, which updates
+    # users.organization_name and so fires trg_users_fts_update. The triggers
+    # are recreated on every start so existing databases pick up these bodies.
+    for name in ('trg_users_fts_insert', 'trg_users_fts_delete', 'trg_users_fts_update', 'trg_orgs_fts_rename'):
+        cur.execute(f'DROP TRIGGER IF EXISTS {name}')
+    cur.execute('''
+    CREATE TRIGGER trg_users_fts_insert AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts (rowid, name, email, org_name)
+        VALUES (NEW.id, NEW.name, NEW.email, NEW.organization_name);
+    END
+    ''')
+    cur.execute('''
+    CREATE TRIGGER trg_users_fts_delete AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts (users_fts, rowid, name, email, org_name)
+        VALUES ('delete', OLD.id, OLD.name, OLD.email, OLD.organization_name);
+    END
+    ''')
+    cur.execute('''
+    CREATE TRIGGER trg_users_fts_update AFTER UPDATE OF name, email, organization_name ON users BEGIN
+        INSERT INTO users_fts (users_fts, rowid, name, email, org_name)
+        VALUES ('delete', OLD.id, OLD.name, OLD.email, OLD.organization_name);
+        INSERT INTO users_fts (rowid, name, email, org_name)
+        VALUES (NEW.id, NEW.name, NEW.email, NEW.organization_name);
+    END
+    ''')
+    if not fts_exists:
+        # index users that were created before the fts table existed
         cur.execute('''
-        INSERT INTO organizations (name, slug, support_email, phone, alt_phone, website, max_coordinators, timezone, language, status, pending_requests)
-        VALUES 
-        ('Massachusetts Institute of Technology', 'mit', 'support@mit.edu', '+1-617-253-1000', '+1-617-253-9999', 'https://mit.edu', 5, 'America/New_York', 'English', 'Active', 45),
-        ('GITAM Institute of Technology', 'gitam', 'gitam@gitam.in', '+91-9676456543', '+91-93473294913', 'https://gitam.edu', 5, 'Asia/Kolkata', 'English', 'Active', 45)
+        INSERT INTO users_fts (rowid, name, email, org_name)
+        SELECT id, name, email, organization_name FROM users
         ''')
-        db.commit()
 
-    cur.execute('SELECT COUNT(*) as c FROM users')
-    if cur.fetchone()['c'] == 0:
+    # Seed with sample data if empty (same transaction as the schema work)
+    cur.execute('SELECT COUNT(*) FROM organizations')
+    if cur.fetchone()[0] == 0:
+        cur.executemany('''
+        INSERT INTO organizations (name, slug, support_email, phone, alt_phone, website, max_coordinators, timezone, language, status, pending_requests)
+        VALUES (?,?,?,?,?,?,?,?,?,?,?)
+        ''', [
+            ('Massachusetts Institute of Technology', 'mit', 'support@mit.edu', '+1-617-253-1000', '+1-617-253-9999', 'https://mit.edu', 5, 'America/New_York', 'English', 'Active', 45),
+            ('GITAM Institute of Technology', 'gitam', 'gitam@gitam.in', '+91-9676456543', '+91-93473294913', 'https://gitam.edu', 5, 'Asia/Kolkata', 'English', 'Active', 45),
+        ])
+
+    cur.execute('SELECT COUNT(*) FROM users')
+    if cur.fetchone()[0] == 0:
         # fetch org ids
-        cur.execute("SELECT id FROM organizations WHERE slug='gitam'")
-        row = cur.fetchone()
-        gitam_id = row['id'] if row else 1
-        cur.execute("SELECT id FROM organizations WHERE slug='mit'")
-        row2 = cur.fetchone()
-        mit_id = row2['id'] if row2 else 2
+        cur.execute("SELECT id, slug FROM organizations WHERE slug IN (?,?)", ('gitam', 'mit'))
+        org_ids = {row['slug']: row['id'] for row in cur.fetchall()}
+        gitam_id = org_ids.get('gitam', 1)
+        mit_id = org_ids.get('mit', 2)
 
         cur.executemany('''
         INSERT INTO users (org_id, name, email, role, phone, timezone)
@@ -91,7 +330,49 @@ def init_db():
             (gitam_id, 'Abhishek Hari', 'abhishek.hari@example.com', 'Co-ordinator', '+91-9000000002', 'Asia/Kolkata'),
             (mit_id, 'Nishta Gupta', 'nishta.gupta@example.com', 'Admin', '+1-617-0000003', 'America/New_York'),
         ])
-        db.commit()
+        cur.execute(sync_org_columns)
+
+    # gather planner statistics once so the indexes above get picked up
+    # (again after a table rebuild, which drops the old tables' statistics)
+    cur.execute("SELECT 1 FROM sqlite_master WHERE name='sqlite_stat1'")
+    if legacy or not cur.fetchone():
+        cur.execute('ANALYZE')
+
+def ojson(data, code=200):
+    # orjson encodes straight to UTF-8 bytes, much faster than jsonify on large row lists
+    return app.response_class(orjson.dumps(data), status=code, mimetype='application/json')
+
+def rows_to_dicts(cur):
+    # read column names once per result set rather than once per row
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, row)) for row in cur]
+
+def page_args():
+    # (before_id, limit, offset) from the query string; before_id gives keyset
+    # paging (pass the last id seen) so deep pages don't pay for OFFSET scans
+    before_id = request.args.get('before_id', type=int) or MAX_ROWID
+    limit = request.args.get('limit', app.config['SEARCH_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, app.config['SEARCH_MAX_PAGE_SIZE']))
+    offset = max(0, request.args.get('offset', 0, type=int))
+    return before_id, limit, offset
+
+def fts_query(q):
+    # turn free text into an AND of quoted prefix terms, e.g. 'dave rich' -> '"dave"* "rich"*'
+    return ' '.join(f'"{t}"*' for t in re.findall(r'\w+', q))
+
+# --- Response caches ---
+# list endpoint name -> encoded JSON body, so cache hits skip both the query and
+# serialization; entries from an older data_version are ignored
+_json_cache = {}
+
+def cached_json(key, data_version):
+    entry = _json_cache.get(key)
+    if entry and entry['data_version'] == data_version:
+        return entry['body']
+    return None
+
+def cache_json(key, data_version, body):
+    _json_cache[key] = {'data_version': data_version, 'body': body}
 
 # Initialize DB on startup
 with app.app_context():
@@ -113,19 +394,24 @@ def users_page():
 # --- REST API endpoints ---
 @app.route('/api/organizations', methods=['GET'])
 def api_get_organizations():
-    db = get_db()
-    cur = db.execute('SELECT * FROM organizations ORDER BY id DESC')
-    orgs = [dict(r) for r in cur.fetchall()]
-    return jsonify(orgs), 200
+    with read_db() as (db, data_version):
+        body = cached_json('organizations', data_version)
+        if body is None:
+            orgs = rows_to_dicts(db.execute(SQL_LIST_ORGS))
+    # encode outside read_db() so other readers are not held up by serialization
+    if body is None:
+        body = orjson.dumps(orgs)
+        cache_json('organizations', data_version, body)
+    return app.response_class(body, mimetype='application/json')
 
 @app.route('/api/organizations/<int:org_id>', methods=['GET'])
 def api_get_organization(org_id):
     db = get_db()
-    cur = db.execute('SELECT * FROM organizations WHERE id=?', (org_id,))
+    cur = db.execute(SQL_GET_ORG, (org_id,))
     row = cur.fetchone()
     if not row:
-        return jsonify({'error': 'Organization not found'}), 404
-    return jsonify(dict(row)), 200
+        return ojson({'error': 'Organization not found'}, 404)
+    return ojson(dict(row))
 
 @app.route('/api/organizations', methods=['POST'])
 def api_create_organization():
@@ -133,15 +419,14 @@ def api_create_organization():
     required = ['name', 'slug']
     for r in required:
         if r not in data or not data[r]:
-            return jsonify({'error': f'{r} is required'}), 400
+            return ojson({'error': f'{r} is required'}, 400)
     # sanitize slug
-    slug = secure_filename(data['slug']).lower()
+    slug = _SLUG_RE.sub('-', data['slug'].lower()).strip('-')
+    if not slug:
+        return ojson({'error': 'slug is required'}, 400)
     db = get_db()
     try:
-        db.execute('''
-            INSERT INTO organizations (name, slug, support_email, phone, alt_phone, website, max_coordinators, timezone, language, status, pending_requests)
-            VALUES (?,?,?,?,?,?,?,?,?,?,?)
-        ''', (
+        cur = db.execute(SQL_INSERT_ORG, (
             data.get('name'),
             slug,
             data.get('support_email'),
@@ -154,100 +439,132 @@ def api_create_organization():
             data.get('status') or 'Active',
             int(data.get('pending_requests') or 0)
         ))
+        row = dict(cur.fetchone())
         db.commit()
     except sqlite3.IntegrityError as e:
-        return jsonify({'error': 'Slug already exists or invalid data'}), 400
+        return ojson({'error': 'Slug already exists or invalid data'}, 400)
 
-    cur = db.execute('SELECT * FROM organizations WHERE slug=?', (slug,))
-    row = dict(cur.fetchone())
-    return jsonify(row), 201
+    return ojson(row, 201)
 
 @app.route('/api/organizations/<int:org_id>/status', methods=['PUT'])
 def api_change_org_status(org_id):
     data = request.get_json()
     if 'status' not in data:
-        return jsonify({'error': 'status required'}), 400
+        return ojson({'error': 'status required'}, 400)
     db = get_db()
-    cur = db.execute('SELECT * FROM organizations WHERE id=?', (org_id,))
-    if not cur.fetchone():
-        return jsonify({'error': 'Organization not found'}), 404
-    db.execute('UPDATE organizations SET status=? WHERE id=?', (data['status'], org_id))
+    cur = db.execute(SQL_UPDATE_ORG_STATUS, (data['status'], org_id))
+    row = cur.fetchone()
+    if not row:
+        return ojson({'error': 'Organization not found'}, 404)
+    org = dict(row)
     db.commit()
-    cur = db.execute('SELECT * FROM organizations WHERE id=?', (org_id,))
-    return jsonify(dict(cur.fetchone())), 200
+    return ojson(org)
 
 @app.route('/api/users', methods=['GET'])
 def api_get_users():
-    db = get_db()
-    cur = db.execute('''
-        SELECT u.*, o.name as organization_name, o.slug as organization_slug
-        FROM users u
-        LEFT JOIN organizations o ON u.org_id = o.id
-        ORDER BY u.id DESC
-    ''')
-    users = [dict(r) for r in cur.fetchall()]
-    return jsonify(users), 200
+    with read_db() as (db, data_version):
+        body = cached_json('users', data_version)
+        if body is None:
+            users = rows_to_dicts(db.execute(SQL_LIST_USERS))
+    if body is None:
+        body = orjson.dumps(users)
+        cache_json('users', data_version, body)
+    return app.response_class(body, mimetype='application/json')
 
-@app.route('/api/users', methods=['POST'])
-def api_create_user():
-    data = request.get_json()
+def user_params(data):
+    # validate one user payload; returns (insert parameters, None) or (None, error message)
+    if not isinstance(data, dict):
+        return None, 'user must be an object'
     required = ['name', 'email', 'role', 'org_id']
     for r in required:
         if r not in data or not data[r]:
-            return jsonify({'error': f'{r} is required'}), 400
+            return None, f'{r} is required'
 
-    db = get_db()
-    cur = db.execute('SELECT * FROM organizations WHERE id=?', (data['org_id'],))
-    if not cur.fetchone():
-        return jsonify({'error': 'Organization does not exist'}), 400
+    try:
+        org_id = int(data['org_id'])
+    except (TypeError, ValueError):
+        return None, 'Organization does not exist'
 
-    db.execute('''
-        INSERT INTO users (org_id, name, email, role, phone, timezone)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (
-        int(data['org_id']),
+    return (
         data['name'],
         data['email'],
         data['role'],
         data.get('phone'),
-        data.get('timezone')
-    ))
+        data.get('timezone'),
+        org_id
+    ), None
+
+@app.route('/api/users', methods=['POST'])
+def api_create_user():
+    params, error = user_params(request.get_json())
+    if error:
+        return ojson({'error': error}, 400)
+
+    db = get_db()
+    try:
+        cur = db.execute(SQL_INSERT_USER, params)
+        row = cur.fetchone()
+        db.commit()
+    except sqlite3.IntegrityError:
+        return ojson({'error': 'Email already exists or invalid data'}, 400)
+    if row is None:
+        return ojson({'error': 'Organization does not exist'}, 400)
+    return ojson(dict(row), 201)
+
+@app.route('/api/users/bulk', methods=['POST'])
+def api_create_users_bulk():
+    data = request.get_json()
+    if not isinstance(data, list) or not data:
+        return ojson({'error': 'a non-empty list of users is required'}, 400)
+    rows = []
+    for i, item in enumerate(data):
+        params, error = user_params(item)
+        if error:
+            return ojson({'error': f'user {i}: {error}'}, 400)
+        rows.append(params)
+
+    # all rows go in with one prepared statement and one commit, or not at all
+    db = get_db()
+    try:
+        cur = db.executemany(SQL_BULK_INSERT_USERS, rows)
+    except sqlite3.IntegrityError:
+        db.rollback()
+        return ojson({'error': 'Email already exists or invalid data'}, 400)
+    if cur.rowcount != len(rows):
+        # some org_id matched no organization, so its row was not inserted
+        db.rollback()
+        return ojson({'error': 'Organization does not exist'}, 400)
     db.commit()
-    cur = db.execute('SELECT u.*, o.name as organization_name FROM users u LEFT JOIN organizations o ON u.org_id=o.id WHERE u.id = last_insert_rowid()')
-    return jsonify(dict(cur.fetchone())), 201
+    return ojson({'created': len(rows)}, 201)
 
 # Simple search endpoints (query params)
 @app.route('/api/organizations/search', methods=['GET'])
 def api_search_orgs():
     q = request.args.get('q', '').strip()
-    db = get_db()
-    if not q:
-        cur = db.execute('SELECT * FROM organizations ORDER BY id DESC')
-    else:
-        pattern = f'%{q}%'
-        cur = db.execute('SELECT * FROM organizations WHERE name LIKE ? OR slug LIKE ? ORDER BY id DESC', (pattern, pattern))
-    return jsonify([dict(r) for r in cur.fetchall()]), 200
+    page = page_args()
+    with read_db() as (db, _):
+        if not q:
+            cur = db.execute(SQL_PAGE_ORGS, page)
+        else:
+            pattern = f'%{q}%'
+            cur = db.execute(SQL_SEARCH_ORGS, (pattern, pattern) + page)
+        orgs = rows_to_dicts(cur)
+    return ojson(orgs)
 
 @app.route('/api/users/search', methods=['GET'])
 def api_search_users():
     q = request.args.get('q', '').strip()
-    db = get_db()
+    page = page_args()
     if not q:
-        cur = db.execute('''
-            SELECT u.*, o.name as organization_name, o.slug as organization_slug
-            FROM users u
-            LEFT JOIN organizations o ON u.org_id = o.id
-            ORDER BY u.id DESC
-        ''')
+        sql, params = SQL_PAGE_USERS, page
     else:
-        pattern = f'%{q}%'
-        cur = db.execute('''
-            SELECT u.*, o.name as organization_name FROM users u
-            LEFT JOIN organizations o ON u.org_id = o.id
-            WHERE u.name LIKE ? OR u.email LIKE ? OR o.name LIKE ?
-            ORDER BY u.id DESC
-        ''', (pattern, pattern, pattern))
-    return jsonify([dict(r) for r in cur.fetchall()]), 200
+        match = fts_query(q)
+        if not match:
+            return ojson([])
+        sql, params = SQL_SEARCH_USERS, (match,) + page
+    with read_db() as (db, _):
+        users = rows_to_dicts(db.execute(sql, params))
+    return ojson(users)
 
 # Run app
 if __name__ == '__main__':
@@ -0,0 +1,10 @@
+# Production server settings: gunicorn -c gunicorn.conf.py app:app
+# Threaded workers keep HTTP connections alive and reuse the pooled sqlite
+# connections; threads matches app.config['DB_POOL_SIZE'] so no request waits
+# on the pool. preload_app stays off: sqlite connections must be opened after
+# the fork, in each worker.
+bind = '0.0.0.0:8000'
+worker_class = 'gthread'
+workers = 2
+threads = 8
+keepalive = 5
@@ -0,0 +1,111 @@
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# what the previous release left on disk: created_at as CURRENT_TIMESTAMP text,
+# and triggers that name both tables, so rebuilding either one must cope with them
+PREVIOUS_SCHEMA = '''
+CREATE TABLE organizations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    slug TEXT UNIQUE NOT NULL,
+    support_email TEXT,
+    phone TEXT,
+    alt_phone TEXT,
+    website TEXT,
+    max_coordinators INTEGER DEFAULT 5,
+    timezone TEXT DEFAULT 'Asia/Kolkata',
+    language TEXT DEFAULT 'English',
+    status TEXT DEFAULT 'Active',
+    pending_requests INTEGER DEFAULT 0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_id INTEGER,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    role TEXT NOT NULL,
+    phone TEXT,
+    timezone TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    organization_name TEXT,
+    organization_slug TEXT,
+    FOREIGN KEY (org_id) REFERENCES organizations(id) ON DELETE CASCADE
+);
+CREATE TRIGGER trg_org_rename AFTER UPDATE OF name, slug ON organizations BEGIN
+    UPDATE users SET organization_name = NEW.name, organization_slug = NEW.slug WHERE org_id = NEW.id;
+END;
+CREATE TRIGGER trg_users_org_change AFTER UPDATE OF org_id ON users BEGIN
+    UPDATE users SET
+        organization_name = (SELECT name FROM organizations WHERE id = NEW.org_id),
+        organization_slug = (SELECT slug FROM organizations WHERE id = NEW.org_id)
+    WHERE id = NEW.id;
+END;
+CREATE INDEX idx_users_org ON users(org_id);
+CREATE UNIQUE INDEX idx_users_email_unique ON users(email);
+CREATE VIRTUAL TABLE users_fts USING fts5(name, email, org_name, content='');
+CREATE TRIGGER trg_users_fts_insert AFTER INSERT ON users BEGIN
+    INSERT INTO users_fts (rowid, name, email, org_name)
+    VALUES (NEW.id, NEW.name, NEW.email, NEW.organization_name);
+END;
+CREATE TRIGGER trg_users_fts_delete AFTER DELETE ON users BEGIN
+    INSERT INTO users_fts (users_fts, rowid, name, email, org_name)
+    VALUES ('delete', OLD.id, OLD.name, OLD.email, OLD.organization_name);
+END;
+CREATE TRIGGER trg_users_fts_update AFTER UPDATE OF name, email, organization_name ON users BEGIN
+    INSERT INTO users_fts (users_fts, rowid, name, email, org_name)
+    VALUES ('delete', OLD.id, OLD.name, OLD.email, OLD.organization_name);
+    INSERT INTO users_fts (rowid, name, email, org_name)
+    VALUES (NEW.id, NEW.name, NEW.email, NEW.organization_name);
+END;
+INSERT INTO organizations (id, name, slug, created_at) VALUES (1, 'Acme', 'acme', '2024-05-01 10:00:00');
+INSERT INTO users (id, org_id, name, email, role, created_at, organization_name, organization_slug)
+VALUES (1, 1, 'Dave Richards', 'dave@example.com', 'Admin', '2024-05-02 11:30:00', 'Acme', 'acme');
+'''
+
+
+class UpgradeTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        shutil.copy(os.path.join(REPO_DIR, 'app.py'), self.dir)
+        # app.py opens the orguser.db next to it and migrates it on import
+        self.db_path = os.path.join(self.dir, 'orguser.db')
+
+    def start_app(self):
+        result = subprocess.run([sys.executable, '-c', 'import app'], cwd=self.dir,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_previous_schema_upgrades_on_start(self):
+        db = sqlite3.connect(self.db_path)
+        db.executescript(PREVIOUS_SCHEMA)
+        db.close()
+
+        self.start_app()
+        self.start_app()  # a second start finds the schema current
+
+        db = sqlite3.connect(self.db_path)
+        self.addCleanup(db.close)
+        for table in ('organizations', 'users'):
+            col_type = db.execute(f"SELECT type FROM pragma_table_info('{table}') WHERE name='created_at'").fetchone()[0]
+            self.assertEqual(col_type, 'INTEGER')
+        self.assertEqual(db.execute('SELECT created_at FROM users WHERE id=1').fetchone()[0], 1714649400)
+        triggers = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type='trigger'")}
+        self.assertTrue({'trg_org_rename', 'trg_users_org_change', 'trg_users_fts_insert'} <= triggers)
+        self.assertEqual(db.execute("SELECT rowid FROM users_fts WHERE users_fts MATCH 'dave'").fetchall(), [(1,)])
+
+        db.execute("UPDATE organizations SET name='Acme Inc' WHERE id=1")
+        self.assertEqual(db.execute('SELECT organization_name FROM users WHERE id=1').fetchone()[0], 'Acme Inc')
+        self.assertEqual(db.execute('PRAGMA integrity_check').fetchone()[0], 'ok')
+
+
+if __name__ == '__main__':
+    unittest.main()